@@ -0,0 +1,123 @@
+import os
+
+import numpy as np
+import xarray as xr
+from numba import njit, prange
+
+from regrid import regrid_linear
+from silo import OPEN_KW, unpack
+
+# Heavy intermediates shared by the plotting scripts. Each artefact is rebuilt
+# automatically when it is missing or older than the data it was derived from;
+# run this script directly to force a full rebuild.
+CACHE_DIR = "cache"
+DEM_FILE = "data/P1152-line-elevation.dat"
+
+YEARS = [2020, 2021, 2022, 2023, 2024]
+RADIATION_FILES = [f"data/solar/{year}.radiation.nc" for year in YEARS]
+
+NUM_POINTS = 200
+
+def cache_path(name: str) -> str:
+    return os.path.join(CACHE_DIR, name)
+
+def is_stale(target: str, sources: list) -> bool:
+    if not os.path.exists(target):
+        return True
+    return os.path.getmtime(target) < max(os.path.getmtime(path) for path in sources)
+
+# === Terrain ===
+def build_terrain():
+    # Imported here so the triangulation only runs when the cache is stale
+    from dem_interp import terrain_grid
+    from fast_dem import gaussian_grid
+    from load_dem import ground, latitude, longitude
+
+    lon_lin = np.linspace(float(longitude.min()), float(longitude.max()), NUM_POINTS)
+    lat_lin = np.linspace(float(latitude.min()), float(latitude.max()), NUM_POINTS)
+
+    # Linear interpolation over the Delaunay triangulation (3d.py)
+    terrain = terrain_grid(lon_lin, lat_lin)
+
+    # Kernel gridding (rain.py). The survey flies N-S lines ~0.74° apart with
+    # sparse E-W tie lines, so the kernel is wide across longitude to bridge
+    # neighbouring lines and narrow along them.
+    terrain_gaussian = gaussian_grid(
+        longitude, latitude, ground,
+        lon_lin, lat_lin, sigma=(0.05, 0.3)
+    )
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    np.save(cache_path("lon_lin.npy"), lon_lin)
+    np.save(cache_path("lat_lin.npy"), lat_lin)
+    np.save(cache_path("terrain_gaussian.npy"), terrain_gaussian)
+    np.save(cache_path("terrain.npy"), terrain)  # written last: gates the rebuild
+
+def load_terrain():
+    """Return lon_lin, lat_lin, terrain and terrain_gaussian (memory-mapped)."""
+    if is_stale(cache_path("terrain.npy"), [DEM_FILE]):
+        build_terrain()
+    return tuple(
+        np.load(cache_path(f"{name}.npy"), mmap_mode="r")
+        for name in ("lon_lin", "lat_lin", "terrain", "terrain_gaussian")
+    )
+
+# === Solar radiation ===
+@njit(parallel=True, cache=True)
+def nanmean_axis0(cube, out):
+    # NaN-skipping mean over the leading (time) axis, rows split across threads
+    nt, ny, nx = cube.shape
+    for i in prange(ny):
+        counts = np.zeros(nx, dtype=np.int64)
+        for j in range(nx):
+            out[i, j] = 0.0
+        for t in range(nt):
+            for j in range(nx):
+                v = cube[t, i, j]
+                if v == v:
+                    out[i, j] += v
+                    counts[j] += 1
+        for j in range(nx):
+            out[i, j] = out[i, j] / counts[j] if counts[j] > 0 else np.nan
+
+def build_radiation_monthly():
+    lon_lin, lat_lin, _, _ = load_terrain()
+
+    # Open all years lazily; dask streams month-sized chunks through regrid -> mean
+    ds = xr.open_mfdataset(RADIATION_FILES, combine="by_coords", chunks={"time": 31}, parallel=True, **OPEN_KW)
+    var = list(ds.data_vars)[0]
+    radiation = unpack(ds[var])
+
+    # Interpolate to consistent grid with one bilinear stencil for all days
+    radiation_interp = regrid_linear(radiation, lon_lin, lat_lin)
+
+    # Compute 5-year monthly averages: dask regrids one month of days across
+    # all years in parallel, then the jitted kernel reduces it
+    time_months = radiation_interp["time"].to_index().month
+    months = np.unique(time_months)
+    monthly = np.empty((len(months), len(lat_lin), len(lon_lin)))
+    for k, month in enumerate(months):
+        cube = radiation_interp.isel(time=np.flatnonzero(time_months == month)).values
+        nanmean_axis0(cube, monthly[k])
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    np.savez(
+        cache_path(f"radiation_monthly_{YEARS[0]}_{YEARS[-1]}.npz"),
+        month=months,
+        radiation=monthly
+    )
+
+def load_radiation_monthly():
+    """Return the calendar months present and their 5-year mean radiation surfaces."""
+    load_terrain()  # the target grid must be current first
+    path = cache_path(f"radiation_monthly_{YEARS[0]}_{YEARS[-1]}.npz")
+    if is_stale(path, RADIATION_FILES + [cache_path("lon_lin.npy"), cache_path("lat_lin.npy")]):
+        build_radiation_monthly()
+    with np.load(path) as cached:
+        return cached["month"], cached["radiation"]
+
+
+if __name__ == "__main__":
+    build_terrain()
+    build_radiation_monthly()
+    print(f"Cache rebuilt in '{CACHE_DIR}/'.")
@@ -1,9 +1,10 @@
 import os
 import xarray as xr
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 
+from silo import OPEN_KW, unpack
+
 # Define coordinates for Queensland cities
 CITY_COORDS = {
     "Brisbane": {"lat": -27.4550, "lon": 153.0351}
@@ -13,57 +14,43 @@ CITY_COORDS = {
 YEARS = [2020, 2021, 2022, 2023, 2024]
 DATA_DIR = "data"
 
-def find_nearest_grid_point(ds: xr.DataArray, target_lat: float, target_lon: float):
-    lat_diff = np.abs(ds["lat"].values - target_lat)
-    lon_diff = np.abs(ds["lon"].values - target_lon)
-    return float(ds["lat"].values[lat_diff.argmin()]), float(ds["lon"].values[lon_diff.argmin()])
+def open_years(pattern: str) -> xr.Dataset:
+    paths = [os.path.join(DATA_DIR, pattern.format(year=year)) for year in YEARS]
+    return xr.open_mfdataset(paths, combine="by_coords", chunks={"time": 366}, parallel=True, **OPEN_KW)
 
 def load_and_aggregate_monthly_climatology(city_name: str):
     lat = CITY_COORDS[city_name]["lat"]
     lon = CITY_COORDS[city_name]["lon"]
 
-    monthly_records = []
-
-    for year in YEARS:
-        max_path = os.path.join(DATA_DIR, f"temp/{year}.max_temp.nc")
-        min_path = os.path.join(DATA_DIR, f"temp/{year}.min_temp.nc")
-        rain_path = os.path.join(DATA_DIR, f"rain/{year}.daily_rain.nc")
-
-        ds_max = xr.open_dataset(max_path)
-        ds_min = xr.open_dataset(min_path)
-        ds_rain = xr.open_dataset(rain_path)
-
-        var_max = list(ds_max.data_vars)[0]
-        var_min = list(ds_min.data_vars)[0]
-        var_rain = list(ds_rain.data_vars)[0]
-
-        grid_lat, grid_lon = find_nearest_grid_point(ds_max[var_max], lat, lon)
-
-        max_vals = ds_max[var_max].sel(lat=grid_lat, lon=grid_lon, method="nearest").to_series()
-        min_vals = ds_min[var_min].sel(lat=grid_lat, lon=grid_lon, method="nearest").to_series()
-        rain_vals = ds_rain[var_rain].sel(lat=grid_lat, lon=grid_lon, method="nearest").to_series()
-
-        df = pd.DataFrame({
-            "max": max_vals,
-            "min": min_vals,
-            "rain": rain_vals
-        })
-        df.index.name = "date"
-        df["mean"] = (df["max"] + df["min"]) / 2
-        df["month"] = df.index.month
-
-        monthly_summary = df.groupby("month").agg({
-            "min": "mean",
-            "mean": "mean",
-            "max": "mean",
-            "rain": "sum"
-        }).reset_index()
-
-        monthly_records.append(monthly_summary)
-
-    # Average over years
-    climatology_df = pd.concat(monthly_records).groupby("month").mean().reset_index()
-    return climatology_df
+    ds_max = open_years("temp/{year}.max_temp.nc")
+    ds_min = open_years("temp/{year}.min_temp.nc")
+    ds_rain = open_years("rain/{year}.daily_rain.nc")
+
+    var_max = list(ds_max.data_vars)[0]
+    var_min = list(ds_min.data_vars)[0]
+    var_rain = list(ds_rain.data_vars)[0]
+
+    # Nearest grid cell; xarray bisects the monotonic lat/lon indexes
+    max_vals = unpack(ds_max[var_max].sel(lat=lat, lon=lon, method="nearest"))
+    min_vals = unpack(ds_min[var_min].sel(lat=lat, lon=lon, method="nearest"))
+    rain_vals = unpack(ds_rain[var_rain].sel(lat=lat, lon=lon, method="nearest"))
+
+    daily = pd.DataFrame({
+        "max": max_vals.to_series(),
+        "min": min_vals.to_series(),
+        "rain": rain_vals.to_series()
+    })
+
+    # Average over years in a single groupby: mean temperatures per calendar
+    # month, and monthly rainfall totals divided by the number of years
+    climatology_df = daily.groupby(daily.index.month.rename("month")).agg({
+        "min": "mean",
+        "max": "mean",
+        "rain": "sum"
+    }).reset_index()
+    climatology_df["rain"] /= len(YEARS)
+    climatology_df["mean"] = (climatology_df["max"] + climatology_df["min"]) / 2
+    return climatology_df[["month", "min", "mean", "max", "rain"]]
 
 def plot_climatology(climatology_df, city_name: str):
     fig = go.Figure()
@@ -152,7 +139,7 @@ def plot_climatology(climatology_df, city_name: str):
         template="plotly_white"
     )
 
-    fig.write_html(f"{city_name.lower()}_monthly_climatology.html")
+    fig.write_html(f"{city_name.lower()}_monthly_climatology.html", include_plotlyjs="cdn", full_html=True, include_mathjax=False)
 
 
 city = "Brisbane"
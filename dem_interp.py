@@ -0,0 +1,27 @@
+import numpy as np
+from scipy.spatial import Delaunay
+
+from fast_dem import dem_grid
+from load_dem import ground, latitude, longitude
+
+# Voxel size (degrees) for thinning the survey before triangulation. Points
+# along a flight line are metres apart, far finer than any output grid.
+VOXEL = 0.005
+
+
+def voxel_downsample(lon, lat, values, cell):
+    """Average the points that fall in the same cell x cell degree voxel."""
+    ix = np.floor((lon - lon.min()) / cell).astype(np.int64)
+    iy = np.floor((lat - lat.min()) / cell).astype(np.int64)
+    _, inverse, counts = np.unique(ix * (iy.max() + 1) + iy, return_inverse=True, return_counts=True)
+    return tuple(np.bincount(inverse, weights=v) / counts for v in (lon, lat, values))
+
+
+# === Triangulate the thinned survey once ===
+pts_lon, pts_lat, values = voxel_downsample(longitude, latitude, ground, VOXEL)
+tri = Delaunay(np.column_stack([pts_lon, pts_lat]))
+
+
+def terrain_grid(lon_lin, lat_lin):
+    """Terrain on a regular grid via the jitted barycentric kernel."""
+    return dem_grid(tri, values, lon_lin, lat_lin)
@@ -0,0 +1,62 @@
+import numpy as np
+from numba import njit
+
+# Largest-Triangle-Three-Buckets downsampling for line traces. The first and
+# last points are kept; every bucket in between keeps the point forming the
+# largest triangle with the previously kept point and the next bucket's mean,
+# which preserves peaks and troughs that plain striding would drop.
+
+@njit(cache=True)
+def _lttb(x, y, n_out):
+    n = len(x)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0] = 0
+    idx[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+
+        # Mean of the next bucket (the last point closes the final bucket)
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        count = 0
+        for j in range(end, next_end):
+            if y[j] == y[j]:
+                avg_x += x[j]
+                avg_y += y[j]
+                count += 1
+        if count > 0:
+            avg_x /= count
+            avg_y /= count
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        best = start
+        best_area = -1.0
+        for j in range(start, end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best_area = area
+                best = j
+        idx[i + 1] = best
+        a = best
+    return idx
+
+def lttb(x, y, n_out=1500):
+    """Indices of the n_out points of (x, y) that LTTB keeps, in order.
+
+    x must be numeric and increasing (pass ``DatetimeIndex.asi8`` for dates).
+    Series no longer than n_out come back whole.
+    """
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    return _lttb(
+        np.ascontiguousarray(x, dtype=np.float64),
+        np.ascontiguousarray(y, dtype=np.float64),
+        n_out
+    )
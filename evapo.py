@@ -52,4 +52,4 @@ fig.update_layout(
     font=dict(size=14)
 )
 
-fig.write_html('et_boxplots_by_month.html')
+fig.write_html('et_boxplots_by_month.html', include_plotlyjs='cdn', full_html=True, include_mathjax=False)
@@ -0,0 +1,61 @@
+import numpy as np
+from numba import njit, prange
+from scipy.ndimage import gaussian_filter
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def interp_grid(lon_lin, lat_lin, simplex_idx, simplices, transforms, values, out):
+    # Barycentric interpolation of each grid node inside its Delaunay simplex;
+    # nodes outside the convex hull (simplex -1) become NaN like griddata().
+    ny, nx = simplex_idx.shape
+    for i in prange(ny):
+        for j in range(nx):
+            s = simplex_idx[i, j]
+            if s < 0:
+                out[i, j] = np.nan
+                continue
+            dx = lon_lin[j] - transforms[s, 2, 0]
+            dy = lat_lin[i] - transforms[s, 2, 1]
+            b0 = transforms[s, 0, 0] * dx + transforms[s, 0, 1] * dy
+            b1 = transforms[s, 1, 0] * dx + transforms[s, 1, 1] * dy
+            out[i, j] = (
+                b0 * values[simplices[s, 0]] +
+                b1 * values[simplices[s, 1]] +
+                (1.0 - b0 - b1) * values[simplices[s, 2]]
+            )
+
+
+def dem_grid(tri, values, lon_lin, lat_lin):
+    """Linearly interpolate a triangulated DEM onto the lon_lin x lat_lin grid."""
+    # Sparse views; the (ny, nx, 2) query array is the only full-size allocation
+    lon_grid, lat_grid = np.meshgrid(lon_lin, lat_lin, sparse=True, copy=False)
+    simplex_idx = tri.find_simplex(np.stack(np.broadcast_arrays(lon_grid, lat_grid), axis=-1))
+    out = np.empty(simplex_idx.shape)
+    interp_grid(lon_lin, lat_lin, simplex_idx, tri.simplices, tri.transform, values, out)
+    return out
+
+
+def gaussian_grid(lon, lat, values, lon_lin, lat_lin, sigma):
+    """Grid scattered points onto lon_lin x lat_lin with a normalised Gaussian kernel.
+
+    Points are binned onto the target grid in one pass and the per-cell sums
+    and counts are smoothed with the same kernel, so the cost is linear in the
+    number of points. sigma is in degrees, either a scalar or a (lat, lon)
+    pair. Cells with no data inside the kernel support are NaN.
+    """
+    ny, nx = len(lat_lin), len(lon_lin)
+    dlon = lon_lin[1] - lon_lin[0]
+    dlat = lat_lin[1] - lat_lin[0]
+    ix = np.rint((lon - lon_lin[0]) / dlon).astype(np.intp)
+    iy = np.rint((lat - lat_lin[0]) / dlat).astype(np.intp)
+    inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+    cell = iy[inside] * nx + ix[inside]
+
+    sums = np.bincount(cell, weights=values[inside], minlength=ny * nx).reshape(ny, nx)
+    counts = np.bincount(cell, minlength=ny * nx).reshape(ny, nx).astype(np.float64)
+
+    sigma_lat, sigma_lon = np.broadcast_to(sigma, 2)
+    sigma_cells = (sigma_lat / dlat, sigma_lon / dlon)
+    num = gaussian_filter(sums, sigma_cells, mode="constant")
+    den = gaussian_filter(counts, sigma_cells, mode="constant")
+    return np.divide(num, den, out=np.full((ny, nx), np.nan), where=den > 0)
@@ -0,0 +1,108 @@
+import numpy as np
+from numba import njit, prange
+from scipy.ndimage import distance_transform_edt
+
+
+@njit(cache=True)
+def _nearest_point(qx, qy, x, y, x0, y0, cell, cell_start, point_idx, empty_dist):
+    # With the query e cells from the centre of its (clamped) home cell and the
+    # nearest occupied cell centre d cells from that centre, some point lies
+    # within e + d + sqrt(2)/2 of the query, while a cell whose centre is r
+    # cells away holds nothing closer than r - e - sqrt(2)/2. Only the annulus
+    # d - 1 <= r <= d + 2e + sqrt(2) can therefore hold the nearest point.
+    ny, nx = empty_dist.shape
+    fx = (qx - x0) / cell
+    fy = (qy - y0) / cell
+    cx = min(max(int(fx), 0), nx - 1)
+    cy = min(max(int(fy), 0), ny - 1)
+    e = np.sqrt((fx - cx - 0.5) ** 2 + (fy - cy - 0.5) ** 2)
+    r_in = max(empty_dist[cy, cx] - 1.0, 0.0)
+    r_out = empty_dist[cy, cx] + 2.0 * e + np.sqrt(2.0)
+
+    best = -1
+    best_d2 = np.inf
+    reach = int(r_out)
+    for dy in range(-reach, reach + 1):
+        row = cy + dy
+        span_out = r_out * r_out - dy * dy
+        if row < 0 or row >= ny or span_out < 0:
+            continue
+        dx_out = int(np.sqrt(span_out))
+        span_in = r_in * r_in - dy * dy
+        dx_in = int(np.sqrt(span_in)) if span_in > 0 else 0
+
+        # Left and right runs of the annulus on this row
+        for lo, hi in ((-dx_out, -dx_in), (max(dx_in, 1), dx_out)):
+            for col in range(max(cx + lo, 0), min(cx + hi, nx - 1) + 1):
+                c = row * nx + col
+                for k in range(cell_start[c], cell_start[c + 1]):
+                    p = point_idx[k]
+                    d2 = (x[p] - qx) ** 2 + (y[p] - qy) ** 2
+                    if d2 < best_d2:
+                        best_d2 = d2
+                        best = p
+    return best
+
+
+# Compiled eagerly for the layouts GridIndex.fill passes and cached on disk, so
+# a cold run loads machine code instead of JIT-compiling on first call
+@njit(
+    "void(float64[::1], float64[::1], boolean[:, :], float64, float64, float64, int32[::1], "
+    "int32[::1], float64[:, ::1], float64[::1], float64[::1], float64[::1], float64[:, :])",
+    parallel=True, fastmath=True, cache=True
+)
+def fill_nearest(grid_x, grid_y, mask, x0, y0, cell, cell_start, point_idx, empty_dist,
+                 pts_lon, pts_lat, pts_elev, out):
+    # Cell (i, j) sits at (grid_x[j], grid_y[i]), so the 2-D mesh is never built.
+    # Raster rows are independent, so they are split across threads
+    for i in prange(mask.shape[0]):
+        for j in range(mask.shape[1]):
+            if mask[i, j]:
+                p = _nearest_point(
+                    grid_x[j], grid_y[i], pts_lon, pts_lat, x0, y0, cell,
+                    cell_start, point_idx, empty_dist
+                )
+                out[i, j] = pts_elev[p]
+
+
+class GridIndex:
+    """Uniform bucket grid over scattered 2-D points for nearest-point queries.
+
+    Cells are sized for a mean occupancy of ``occupancy`` points over the
+    bounding box, and the points of cell c are
+    ``point_idx[cell_start[c]:cell_start[c + 1]]`` (CSR layout). Survey points
+    sit on flight lines, so a query is seeded with the distance transform of
+    the empty cells instead of spiralling out through them one ring at a time.
+    """
+
+    def __init__(self, x, y, occupancy=2.5):
+        # Owned, writable copies: the eager fill_nearest signature rejects
+        # read-only views such as pandas' copy-on-write columns
+        self.x = np.array(x, dtype=np.float64)
+        self.y = np.array(y, dtype=np.float64)
+        self.x0, self.y0 = self.x.min(), self.y.min()
+        width, height = self.x.max() - self.x0, self.y.max() - self.y0
+        self.cell = np.sqrt(width * height * occupancy / len(self.x))
+        self.nx = int(width / self.cell) + 1
+        self.ny = int(height / self.cell) + 1
+
+        cx = ((self.x - self.x0) / self.cell).astype(np.int64)
+        cy = ((self.y - self.y0) / self.cell).astype(np.int64)
+        cell_id = cy * self.nx + cx
+        self.point_idx = np.argsort(cell_id, kind="stable").astype(np.int32)
+        counts = np.bincount(cell_id, minlength=self.nx * self.ny)
+        self.cell_start = np.zeros(self.nx * self.ny + 1, dtype=np.int32)
+        np.cumsum(counts, out=self.cell_start[1:])
+
+        # Distance (in cells) from each cell centre to the nearest occupied cell
+        self.empty_dist = distance_transform_edt(counts.reshape(self.ny, self.nx) == 0)
+
+    def fill(self, grid_x, grid_y, mask, values, out):
+        """Set out[mask] to the value of the point nearest each masked cell of the grid_y x grid_x raster."""
+        fill_nearest(
+            np.array(grid_x, dtype=np.float64),
+            np.array(grid_y, dtype=np.float64),
+            mask, self.x0, self.y0, self.cell, self.cell_start,
+            self.point_idx, self.empty_dist, self.x, self.y,
+            np.array(values, dtype=np.float64), out
+        )
@@ -1,62 +1,19 @@
 import numpy as np
 import pandas as pd
-import xarray as xr
 import plotly.graph_objects as go
 
-# === Load and interpolate DEM ===
-cols = [
-    'line', 'dateCode', 'flight', 'survey', 'FID',
-    'altitude', 'bearing', 'gpshgt', 'ground', 'lasalt',
-    'latitude', 'longitude', 'radalt'
-]
-df = pd.read_csv("data/P1152-line-elevation.dat", sep=r'\s+', header=None, names=cols)
-df.replace([-9999999, -99999999, -999999, -9.999999e+32, -9.9999999999e+32], np.nan, inplace=True)
-df.dropna(subset=['latitude', 'longitude', 'ground'], inplace=True)
-
-# Define interpolation grid (matching Queensland)
-num_points = 200
-lon_lin = np.linspace(df['longitude'].min(), df['longitude'].max(), num_points)
-lat_lin = np.linspace(df['latitude'].min(), df['latitude'].max(), num_points)
-
-# === Load and interpolate solar radiation for 2020–2024 ===
-YEARS = [2020, 2021, 2022, 2023, 2024]
-radiation_surfaces_by_month = [[] for _ in range(12)]  # Jan to Dec
-
-for year in YEARS:
-    ds = xr.open_dataset(f"data/solar/{year}.radiation.nc")
-    var = list(ds.data_vars)[0]
-    radiation = ds[var]
-    times = pd.to_datetime(radiation['time'].values)
-
-    # Interpolate to consistent grid
-    radiation_interp = radiation.interp(
-        lon=xr.DataArray(lon_lin, dims="lon"),
-        lat=xr.DataArray(lat_lin, dims="lat"),
-        method="linear"
-    )
+from build_cache import load_terrain, load_radiation_monthly
 
-    # Collect monthly data
-    for month in range(1, 13):
-        month_idxs = np.where(times.month == month)[0]
-        if len(month_idxs) == 0:
-            continue
-        month_data = radiation_interp.isel(time=month_idxs).mean(dim='time', skipna=True)
-        radiation_surfaces_by_month[month - 1].append(month_data.values)
+# Interpolation grid (matching Queensland) and 2020–2024 monthly radiation
+lon_lin, lat_lin, _, _ = load_terrain()
+months, monthly = load_radiation_monthly()
 
-# Compute 5-year monthly averages
-radiation_surfaces = []
-month_labels = []
-for month_idx in range(12):
-    if len(radiation_surfaces_by_month[month_idx]) == 0:
-        continue
-    stacked = np.stack(radiation_surfaces_by_month[month_idx])
-    monthly_avg = np.nanmean(stacked, axis=0)
-    radiation_surfaces.append(monthly_avg)
-    month_labels.append(pd.Timestamp(f"2020-{month_idx+1:02d}-01").strftime('%B'))
+radiation_cube = monthly.astype(np.float32)  # (month, lat, lon)
+month_labels = [pd.Timestamp(f"2020-{month:02d}-01").strftime('%B') for month in months]
 
 # Color scale configuration
-fixed_zmin = np.min([np.nanmin(surface) for surface in radiation_surfaces])
-fixed_zmax = np.max([np.nanmax(surface) for surface in radiation_surfaces])
+fixed_zmin = float(np.nanmin(radiation_cube))
+fixed_zmax = float(np.nanmax(radiation_cube))
 
 custom_colorscale = [
     [0.0,  "rgb(70,130,180)"],    # steel blue (low radiation)
@@ -74,24 +31,14 @@ city_locs = {
     "Cairns":     {"lon": 145.7633, "lat": -16.8878}
 }
 
-# Prepare hover text from January
-z_data = radiation_surfaces[0]
-custom_text = np.empty(z_data.shape, dtype=object)
-for i in range(z_data.shape[0]):
-    for j in range(z_data.shape[1]):
-        val = z_data[i, j]
-        if np.isnan(val):
-            custom_text[i, j] = (
-                f"Longitude: {lon_lin[j]:.3f}°<br>" +
-                f"Latitude: {lat_lin[i]:.3f}°<br>" +
-                "Radiation: NaN MJ/m²"
-            )
-        else:
-            custom_text[i, j] = (
-                f"Longitude: {lon_lin[j]:.3f}°<br>" +
-                f"Latitude: {lat_lin[i]:.3f}°<br>" +
-                f"Radiation: {val:.2f} MJ/m²"
-            )
+# Hover is formatted client-side from x/y/z, so no per-cell text is shipped
+hover_template = (
+    "Longitude: %{x:.3f}°<br>" +
+    "Latitude: %{y:.3f}°<br>" +
+    "Radiation: %{z:.2f} MJ/m²<extra></extra>"
+)
+
+z_data = radiation_cube[0]
 
 # === Plotting ===
 initial_heat = go.Heatmap(
@@ -103,8 +50,7 @@ initial_heat = go.Heatmap(
     zmax=fixed_zmax,
     colorbar=dict(title="Solar Radiation (MJ/m²)"),
     showscale=True,
-    text=custom_text,
-    hovertemplate="%{text}<extra></extra>"
+    hovertemplate=hover_template
 )
 
 fig = go.Figure(data=[initial_heat])
@@ -126,40 +72,12 @@ for city, coords in city_locs.items():
     )
 
 # === Prepare frames for animation ===
+# Frames only carry z; axes, colour scale and hover are inherited from trace 0
 frames = []
-for i, (surface, label) in enumerate(zip(radiation_surfaces, month_labels)):
-    # Create hover text for each frame
-    frame_text = np.empty(surface.shape, dtype=object)
-    for row in range(surface.shape[0]):
-        for col in range(surface.shape[1]):
-            val = surface[row, col]
-            if np.isnan(val):
-                frame_text[row, col] = (
-                    f"Longitude: {lon_lin[col]:.3f}°<br>" +
-                    f"Latitude: {lat_lin[row]:.3f}°<br>" +
-                    "Radiation: NaN MJ/m²"
-                )
-            else:
-                frame_text[row, col] = (
-                    f"Longitude: {lon_lin[col]:.3f}°<br>" +
-                    f"Latitude: {lat_lin[row]:.3f}°<br>" +
-                    f"Radiation: {val:.2f} MJ/m²"
-                )
-
+for i, (surface, label) in enumerate(zip(radiation_cube, month_labels)):
     frames.append(go.Frame(
-        data=[
-            go.Heatmap(
-                z=surface,
-                x=lon_lin,
-                y=lat_lin,
-                colorscale=custom_colorscale,
-                zmin=fixed_zmin,
-                zmax=fixed_zmax,
-                colorbar=dict(title="Solar Radiation (MJ/m²)"),
-                text=frame_text,
-                hovertemplate="%{text}<extra></extra>"
-            )
-        ],
+        data=[go.Heatmap(z=surface)],
+        traces=[0],
         name=label,
         layout=go.Layout(
             title_text=f"Average Monthly Solar Radiation in Queensland (2020-2024) - {label}"
@@ -259,4 +177,4 @@ fig.update_layout(
     }]
 )
 
-fig.write_html("solar_radiation_animation.html")
+fig.write_html("solar_radiation_animation.html", include_plotlyjs="cdn", full_html=True, include_mathjax=False)
@@ -0,0 +1,10 @@
+import numpy as np
+
+# === Load DEM from .dat ===
+# Only ground (col 8), latitude (col 10) and longitude (col 11) of the 13
+# columns are used, so parse just those as float32.
+arr = np.loadtxt("data/P1152-line-elevation.dat", usecols=(8, 10, 11), dtype=np.float32)
+
+# Drop rows with a null sentinel (-999999, -9999999, -9.9999999999e+32, ...)
+arr = arr[((arr > -99999) & np.isfinite(arr)).all(axis=1)]
+ground, latitude, longitude = arr.T
@@ -1,99 +1,76 @@
 import numpy as np
 import pandas as pd
-from scipy.interpolate import griddata
 import plotly.graph_objects as go
 import xarray as xr
 
-# === Load and interpolate DEM from your .dat file ===
-cols = [
-    'line', 'dateCode', 'flight', 'survey', 'FID',
-    'altitude', 'bearing', 'gpshgt', 'ground', 'lasalt',
-    'latitude', 'longitude', 'radalt'
-]
-
-df = pd.read_csv("data/P1152-line-elevation.dat", sep=r'\s+', header=None, names=cols)
-df.replace([-9999999, -99999999, -999999, -9.999999e+32, -9.9999999999e+32], np.nan, inplace=True)
-df.dropna(subset=['latitude', 'longitude', 'ground'], inplace=True)
+from build_cache import load_terrain
+from regrid import regrid_linear
+from silo import OPEN_KW, unpack
 
-# Grid
-num_points = 200
-lon_lin = np.linspace(df['longitude'].min(), df['longitude'].max(), num_points)
-lat_lin = np.linspace(df['latitude'].min(), df['latitude'].max(), num_points)
-lon_grid, lat_grid = np.meshgrid(lon_lin, lat_lin)
-
-points = df[['longitude', 'latitude']].values
-values = df['ground'].values
-terrain_data = griddata(points, values, (lon_grid, lat_grid), method='linear')
+# === Load gridded DEM (cached) ===
+lon_lin, lat_lin, _, terrain_data = load_terrain()
 
 # === Load Daily Rainfall from NetCDF ===
 rain_nc_path = "data/rain/2025.daily_rain.nc"
-ds = xr.open_dataset(rain_nc_path)
+ds = xr.open_dataset(rain_nc_path, **OPEN_KW)
 
 # Ensure proper variable names
 rain_var = [v for v in ds.data_vars][0]  # Automatically detect first variable
-rain = ds[rain_var]
+rain = unpack(ds[rain_var])
 times = pd.to_datetime(rain['time'].values)
 
-# Interpolate the entire rainfall dataset to terrain grid
-lon_da = xr.DataArray(lon_lin, dims="lon")
-lat_da = xr.DataArray(lat_lin, dims="lat")
-rain_interp = rain.interp(lon=lon_da, lat=lat_da, method="linear")
+# Interpolate the entire rainfall dataset to terrain grid (one shared stencil)
+rain_interp = regrid_linear(rain, lon_lin, lat_lin)
 
-rain_surfaces = []
-for i in range(len(times)):
-    rain_day = rain_interp.isel(time=i).values.astype(np.float32)
-    rain_day[rain_day <= -32765] = np.nan
-    rain_surfaces.append(rain_day)
+# Materialise the interpolated cube once and mask fill values in one pass
+rain_cube = rain_interp.astype(np.float32).values
+rain_cube[rain_cube <= -32765] = np.nan
 
 
 # Set consistent rainfall color scale
-all_rain_values = np.concatenate([np.nan_to_num(r, nan=0).flatten() for r in rain_surfaces])
+all_rain_values = np.nan_to_num(rain_cube, nan=0).ravel()
 rain_cmin = 0
 rain_cmax = np.percentile(all_rain_values, 99.5)  # Avoid extreme outliers
 
+# float32 surfaces ship as typed arrays; no-data cells stay NaN, off the colour scale
+rain_surfaces = list(rain_cube)
+terrain_data = terrain_data.astype(np.float32)
+
 # Base figure with terrain
 fig = go.Figure()
 
-# === Static base 3D terrain ===
+# === Terrain coloured by rainfall (trace 0) ===
+# The terrain mesh is shipped once; animation frames only swap surfacecolor.
 fig.add_trace(
     go.Surface(
-        z=terrain_data,
+        z=terrain_data + 0.5,
         x=lon_lin,
         y=lat_lin,
-        colorscale='Greys',
-        showscale=False,
+        surfacecolor=rain_surfaces[0],
+        cmin=rain_cmin,
+        cmax=rain_cmax,
+        colorscale='Blues_r',
+        reversescale=True,
+        opacity=0.6,
+        showscale=True,
+        colorbar=dict(title='Rainfall Intensity (mm/day)'),
         name='Terrain',
         hovertemplate=
             "Longitude: %{x:.4f}<br>" +
             "Latitude: %{y:.4f}<br>" +
-            "Elevation: %{z:.2f} m<extra></extra>",
-        opacity=1.0
+            "Elevation: %{z:.2f} m<extra></extra>"
     ),
 )
 
 # === Frames for animation ===
-frames = []
-for i, rain_surface in enumerate(rain_surfaces):
-    frame_data = []
-
-    # Only include rainfall in frame (terrain stays static)
-    frame_data.append(
-        go.Surface(
-            z=terrain_data + 0.5,
-            x=lon_lin,
-            y=lat_lin,
-            surfacecolor=rain_surface,
-            cmin=rain_cmin,
-            cmax=rain_cmax,
-            colorscale='Blues_r',
-            reversescale=True,
-            opacity=0.6,
-            showscale=True,
-            colorbar=dict(title='Rainfall Intensity (mm/day)')
-        )
+frames = [
+    go.Frame(
+        data=[go.Surface(surfacecolor=rain_surface)],
+        name=str(times[i].date()),
+        traces=[0]
     )
-
-    frames.append(go.Frame(data=frame_data, name=str(times[i].date())))
+    for i, rain_surface in enumerate(rain_surfaces)
+]
 
 
 # === Update layout ===
@@ -156,4 +133,4 @@ fig.update_layout(
 )
 
 fig.frames = frames
-fig.write_html("queensland_rainfall.html")
+fig.write_html("queensland_rainfall.html", include_plotlyjs="cdn", full_html=True, include_mathjax=False)
@@ -0,0 +1,36 @@
+import numpy as np
+import xarray as xr
+
+# Bilinear regridding from a regular source grid onto a fixed target grid.
+# The stencil (lower-neighbour index + weight per axis) depends only on the
+# two grids, so it is computed once and reused for every time step and file.
+
+def bilinear_stencil(src, dst):
+    """Lower-neighbour index and weight of each dst coordinate on regular axis src."""
+    pos = (dst - src[0]) / (src[1] - src[0])
+    idx = np.clip(np.floor(pos).astype(np.intp), 0, len(src) - 2)
+    weight = pos - idx
+    weight[(pos < 0) | (pos > len(src) - 1)] = np.nan  # outside source grid
+    return idx, weight
+
+def regrid_linear(da: xr.DataArray, lon_lin, lat_lin) -> xr.DataArray:
+    """Regrid da (..., lat, lon) onto lon_lin x lat_lin; stays lazy if da is dask-backed."""
+    lon_lin, lat_lin = np.asarray(lon_lin), np.asarray(lat_lin)
+    i_lat, w_lat = bilinear_stencil(da["lat"].values, lat_lin)
+    i_lon, w_lon = bilinear_stencil(da["lon"].values, lon_lin)
+
+    def regrid(cube):
+        # Separable gather + weighted sum: rows first, then columns
+        rows = cube[..., i_lat, :] * (1 - w_lat)[:, None] + cube[..., i_lat + 1, :] * w_lat[:, None]
+        return rows[..., i_lon] * (1 - w_lon) + rows[..., i_lon + 1] * w_lon
+
+    return xr.apply_ufunc(
+        regrid,
+        da,
+        input_core_dims=[["lat", "lon"]],
+        output_core_dims=[["lat", "lon"]],
+        exclude_dims={"lat", "lon"},
+        dask="parallelized",
+        output_dtypes=[np.float64],
+        dask_gufunc_kwargs={"output_sizes": {"lat": len(lat_lin), "lon": len(lon_lin)}}
+    ).assign_coords(lat=lat_lin, lon=lon_lin)
@@ -1,8 +1,14 @@
 import os
+from functools import lru_cache
+
 import xarray as xr
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
+from numba import njit
+
+from build_cache import CACHE_DIR, cache_path, is_stale
+from silo import OPEN_KW, nearest_idx, unpack
 
 CITY_COORDS = {
     "Brisbane": {"lat": -27.4550, "lon": 153.0351}
@@ -11,53 +17,98 @@ CITY_COORDS = {
 YEARS = [2020, 2021, 2022, 2023, 2024]
 DATA_DIR = "data/rh"
 
-def find_nearest_grid_point(ds, target_lat, target_lon):
-    lat_diff = np.abs(ds["lat"].values - target_lat)
-    lon_diff = np.abs(ds["lon"].values - target_lon)
-    return float(ds["lat"].values[lat_diff.argmin()]), float(ds["lon"].values[lon_diff.argmin()])
+# FORMAT=png writes a static image via kaleido instead of the interactive HTML
+FORMAT = os.environ.get("FORMAT", "html")
+if FORMAT not in {"html", "png"}:
+    raise ValueError(f"FORMAT must be 'html' or 'png', got {FORMAT!r}")
 
-def get_season(month):
-    return {
-        12: "Summer", 1: "Summer", 2: "Summer",
-        3: "Autumn", 4: "Autumn", 5: "Autumn",
-        6: "Winter", 7: "Winter", 8: "Winter",
-        9: "Spring", 10: "Spring", 11: "Spring"
-    }[month]
+# Southern-hemisphere seasons, indexed by (month % 12) // 3
+SEASONS = ["Summer", "Autumn", "Winter", "Spring"]
 
-def load_rh_data(year, city_coords):
-    tmax_path = os.path.join(DATA_DIR, f"{year}.rh_tmax.nc")
-    tmin_path = os.path.join(DATA_DIR, f"{year}.rh_tmin.nc")
+def find_nearest_grid_point(ds, target_lat, target_lon):
+    return nearest_idx(ds["lat"].values, target_lat), nearest_idx(ds["lon"].values, target_lon)
 
-    ds_tmax = xr.open_dataset(tmax_path)
-    ds_tmin = xr.open_dataset(tmin_path)
+def rh_files(kind):
+    return [os.path.join(DATA_DIR, f"{year}.rh_{kind}.nc") for year in YEARS]
 
-    var_tmax = list(ds_tmax.data_vars)[0]
-    var_tmin = list(ds_tmin.data_vars)[0]
+def load_rh_data(city_coords):
+    # Both products for all years open lazily as one dataset: SILO names each
+    # variable after its product (rh_tmax, rh_tmin) and they share the grid
+    ds = xr.open_mfdataset(
+        rh_files("tmax") + rh_files("tmin"), combine="by_coords", coords="minimal",
+        compat="override", chunks={"time": 365}, parallel=True, **OPEN_KW
+    )
 
     lat, lon = city_coords["lat"], city_coords["lon"]
-    grid_lat, grid_lon = find_nearest_grid_point(ds_tmax, lat, lon)
+    i_lat, i_lon = find_nearest_grid_point(ds, lat, lon)
+
+    # Only the city's column is ever read
+    cell = ds.isel(lat=i_lat, lon=i_lon)
+    tmax = unpack(cell["rh_tmax"])
+    tmin = unpack(cell["rh_tmin"])
 
-    tmax = ds_tmax[var_tmax].sel(lat=grid_lat, lon=grid_lon, method="nearest")
-    tmin = ds_tmin[var_tmin].sel(lat=grid_lat, lon=grid_lon, method="nearest")
+    # One compute for the whole period; percent differences are fine at fp32
+    delta_rh = (tmin - tmax).astype(np.float32).values
 
     df = pd.DataFrame({
         "date": pd.to_datetime(tmax["time"].values),
-        "rh_tmax": tmax.values,
-        "rh_tmin": tmin.values
+        "delta_rh": delta_rh
     })
-    df["delta_rh"] = df["rh_tmin"] - df["rh_tmax"]
-    df["year"] = df["date"].dt.year.astype(str)
-    df["season"] = df["date"].dt.month.map(get_season)
+    df["year"] = df["date"].dt.year.astype(np.int16)
+    months = df["date"].dt.month.to_numpy()
+    df["season"] = pd.Categorical.from_codes((months % 12) // 3, categories=SEASONS)
     return df
 
+@lru_cache(maxsize=None)
+def load_city_rh(city_name):
+    """Daily ΔRH for city_name, cached on disk until the RH files change."""
+    # The key covers the coordinates and year span, so editing CITY_COORDS or
+    # YEARS starts a fresh file instead of serving a stale series
+    coords = CITY_COORDS[city_name]
+    path = cache_path(
+        f"{city_name.lower().replace(' ', '_')}_{coords['lat']:.4f}_{coords['lon']:.4f}"
+        f"_{YEARS[0]}_{YEARS[-1]}_rh.parquet"
+    )
+    if not is_stale(path, rh_files("tmax") + rh_files("tmin")):
+        return pd.read_parquet(path)
+    df = load_rh_data(coords)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    df.to_parquet(path, compression="zstd", index=False)
+    return df
+
+# Compiled eagerly for the one signature used below and cached on disk, so a
+# cold run loads machine code instead of JIT-compiling on first call
+@njit("float64[::1](int64[::1], float32[::1], int64)", cache=True)
+def group_mean(gkey, values, ngroups):
+    # Mean of values per small integer key, skipping NaN like pandas;
+    # empty groups come out as NaN. Keys must lie in [0, ngroups).
+    sums = np.zeros(ngroups)
+    counts = np.zeros(ngroups, dtype=np.int64)
+    for i in range(len(gkey)):
+        if values[i] != values[i]:
+            continue
+        sums[gkey[i]] += values[i]
+        counts[gkey[i]] += 1
+    return sums / counts
+
 def aggregate_seasonal_deltas(city_name):
-    all_years_df = []
-    for year in YEARS:
-        df = load_rh_data(year, CITY_COORDS[city_name])
-        all_years_df.append(df)
-    combined = pd.concat(all_years_df)
-    grouped = combined.groupby(["year", "season"])["delta_rh"].mean().reset_index()
-    return grouped
+    combined = load_city_rh(city_name)
+
+    # Only len(YEARS) x 4 groups, keyed year-major so no sort is needed
+    # Rows outside YEARS would index past the group table, so drop them
+    year_codes = combined["year"].to_numpy(np.int64) - YEARS[0]
+    in_years = (year_codes >= 0) & (year_codes < len(YEARS))
+    gkey = (year_codes * len(SEASONS) + combined["season"].cat.codes.to_numpy())[in_years]
+    values = combined["delta_rh"].to_numpy(np.float32)[in_years]
+    means = group_mean(gkey, values, len(YEARS) * len(SEASONS))
+
+    keys = np.arange(len(means))
+    grouped = pd.DataFrame({
+        "year": np.array(YEARS, dtype=np.int16)[keys // len(SEASONS)],
+        "season": pd.Categorical.from_codes(keys % len(SEASONS), categories=SEASONS),
+        "delta_rh": means
+    })
+    return grouped[~np.isnan(means)]
 
 def plot_seasonal_delta_rh(grouped_df, city_name):
     seasons = ["Spring", "Summer", "Autumn", "Winter"]
@@ -86,8 +137,8 @@ def plot_seasonal_delta_rh(grouped_df, city_name):
         )
 
         fig.add_trace(go.Scatter(
-            x=season_df["year"],
-            y=season_df["delta_rh"],
+            x=season_df["year"].to_numpy(),
+            y=season_df["delta_rh"].to_numpy(),
             mode="lines+markers",
             name=season,
             line=dict(
@@ -101,7 +152,7 @@ def plot_seasonal_delta_rh(grouped_df, city_name):
 
     fig.update_layout(
         title=f"Seasonal Relative Humidity Difference (ΔRH) in {city_name} (2020-2024)",
-        xaxis_title="Year",
+        xaxis=dict(title="Year", type="category"),
         yaxis_title="ΔRH (%)",
         legend_title="Season",
         height=500,
@@ -111,7 +162,11 @@ def plot_seasonal_delta_rh(grouped_df, city_name):
         hovermode="x unified",
         font=dict(family="Arial", size=14),
     )
-    fig.write_html(f"seasonal_delta_rh_{city_name.lower()}.html")
+    output_filename = f"seasonal_delta_rh_{city_name.lower()}.{FORMAT}"
+    if FORMAT == "png":
+        fig.write_image(output_filename, width=850, height=500, scale=2)
+    else:
+        fig.write_html(output_filename, include_plotlyjs="cdn", full_html=True, include_mathjax=False)
 
 if __name__ == "__main__":
     for city in CITY_COORDS.keys():
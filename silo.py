@@ -0,0 +1,25 @@
+import numpy as np
+import xarray as xr
+
+# SILO gridded NetCDF files are HDF5 underneath. Opening them with h5netcdf and
+# without CF mask/scale decoding skips the per-variable decode pipeline; the
+# packing is undone with unpack() only on the values actually used.
+OPEN_KW = dict(engine="h5netcdf", mask_and_scale=False, decode_coords=False)
+
+def unpack(da: xr.DataArray) -> xr.DataArray:
+    """Apply the fill-value masking and scale/offset skipped by OPEN_KW."""
+    out = da.astype(np.float32)
+    for key in ("_FillValue", "missing_value"):
+        if key in da.attrs:
+            out = out.where(da != da.attrs[key])
+    return out * da.attrs.get("scale_factor", 1) + da.attrs.get("add_offset", 0)
+
+def nearest_idx(axis, t):
+    """Position of the value nearest t on the monotonic 1-D coordinate axis."""
+    axis = np.asarray(axis)
+    if axis[0] > axis[-1]:  # descending axis: search it reversed
+        return len(axis) - 1 - nearest_idx(axis[::-1], t)
+    k = int(np.searchsorted(axis, t))
+    if k > 0 and (k == len(axis) or abs(axis[k - 1] - t) <= abs(axis[k] - t)):
+        return k - 1
+    return k
@@ -1,8 +1,12 @@
+import os
 import xarray as xr
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 
+from downsample import lttb
+from silo import OPEN_KW, nearest_idx, unpack
+
 CITY_COORDS = {
     "Brisbane":   {"lat": -27.4550, "lon": 153.0351},
     "Gold Coast": {"lat": -28.0815, "lon": 153.4482},
@@ -13,12 +17,16 @@ CITY_COORDS = {
 MAX_TEMP_FILE = "data/2025.max_temp.nc"
 MIN_TEMP_FILE = "data/2025.min_temp.nc"
 
+# Longer series are thinned with LTTB before plotting
+MAX_PLOT_POINTS = 1500
+
+# FORMAT=png writes a static image via kaleido instead of the interactive HTML
+FORMAT = os.environ.get("FORMAT", "html")
+if FORMAT not in {"html", "png"}:
+    raise ValueError(f"FORMAT must be 'html' or 'png', got {FORMAT!r}")
+
 def find_nearest_grid_point(ds: xr.DataArray, target_lat: float, target_lon: float):
-    lat_diff = np.abs(ds["lat"].values - target_lat)
-    lon_diff = np.abs(ds["lon"].values - target_lon)
-    i_lat = lat_diff.argmin()
-    i_lon = lon_diff.argmin()
-    return float(ds["lat"].values[i_lat]), float(ds["lon"].values[i_lon])
+    return nearest_idx(ds["lat"].values, target_lat), nearest_idx(ds["lon"].values, target_lon)
 
 def extract_time_series(
     max_ds: xr.Dataset,
@@ -35,17 +43,17 @@ def extract_time_series(
     time_index = pd.to_datetime(max_temp["time"].values)
 
     tgt_lat, tgt_lon = city_coords["lat"], city_coords["lon"]
-    nearest_lat, nearest_lon = find_nearest_grid_point(max_temp, tgt_lat, tgt_lon)
+    i_lat, i_lon = find_nearest_grid_point(max_temp, tgt_lat, tgt_lon)
 
-    max_ts = max_temp.sel(lat=nearest_lat, lon=nearest_lon, method="nearest").values
-    min_ts = min_temp.sel(lat=nearest_lat, lon=nearest_lon, method="nearest").values
+    max_ts = unpack(max_temp.isel(lat=i_lat, lon=i_lon)).values
+    min_ts = unpack(min_temp.isel(lat=i_lat, lon=i_lon)).values
 
     return {
         "time": time_index,
         "max": max_ts,
         "min": min_ts,
-        "grid_lat": nearest_lat,
-        "grid_lon": nearest_lon,
+        "grid_lat": float(max_temp["lat"].values[i_lat]),
+        "grid_lon": float(max_temp["lon"].values[i_lon]),
     }
 
 
@@ -58,21 +66,27 @@ def generate_temp_figure(
         raise ValueError(f"City '{city_name}' not found. Options: {list(CITY_COORDS)}")
 
     # Load data
-    max_ds = xr.open_dataset(max_temp_file)
-    min_ds = xr.open_dataset(min_temp_file)
+    max_ds = xr.open_dataset(max_temp_file, **OPEN_KW)
+    min_ds = xr.open_dataset(min_temp_file, **OPEN_KW)
 
     series = extract_time_series(max_ds, min_ds, city_name, CITY_COORDS[city_name])
     times = series["time"]
-    max_vals = series["max"]
-    min_vals = series["min"]
+    # float32 keeps the traces on Plotly's typed-array (base64) encoding path
+    max_vals = series["max"].astype(np.float32, copy=False)
+    min_vals = series["min"].astype(np.float32, copy=False)
+
+    # A year of days passes through untouched; multi-year series are thinned
+    # per trace so each keeps its own extremes
+    keep_max = lttb(times.asi8, max_vals, MAX_PLOT_POINTS)
+    keep_min = lttb(times.asi8, min_vals, MAX_PLOT_POINTS)
 
     fig = go.Figure()
 
     # Max Temp (solid red)
     fig.add_trace(
         go.Scatter(
-            x=times,
-            y=max_vals,
+            x=times[keep_max],
+            y=max_vals[keep_max],
             mode="lines",
             name="Max",
             line=dict(color="firebrick", width=2),
@@ -82,8 +96,8 @@ def generate_temp_figure(
     # Min Temp (dashed blue)
     fig.add_trace(
         go.Scatter(
-            x=times,
-            y=min_vals,
+            x=times[keep_min],
+            y=min_vals[keep_min],
             mode="lines",
             name="Min",
             line=dict(color="royalblue", width=2, dash="dash"),
@@ -119,8 +133,11 @@ def generate_temp_figure(
         width=900
     )
 
-    output_filename = f"{city_name.lower().replace(' ', '_')}_temps.html"
-    fig.write_html(output_filename)
+    output_filename = f"{city_name.lower().replace(' ', '_')}_temps.{FORMAT}"
+    if FORMAT == "png":
+        fig.write_image(output_filename, width=900, height=500, scale=2)
+    else:
+        fig.write_html(output_filename, include_plotlyjs="cdn", full_html=True, include_mathjax=False)
     print(f"Saved figure for {city_name} to '{output_filename}'.")
 
 
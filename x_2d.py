@@ -1,23 +1,39 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import numpy as np
-from scipy.interpolate import griddata
+from scipy.spatial import Delaunay
+from scipy.interpolate import LinearNDInterpolator
 import matplotlib.pyplot as plt
 
+from grid_index import GridIndex
+
+# FORMAT=png saves the raster instead of opening an interactive window
+FORMAT = os.environ.get("FORMAT", "html")
+if FORMAT not in {"html", "png"}:
+    raise ValueError(f"FORMAT must be 'html' or 'png', got {FORMAT!r}")
+
 # 1) Load elevation points
 col_names = [
     "line", "dateCode", "flight", "survey", "FID",
     "altitude", "bearing", "gpshgt", "ground", "lasalt",
     "latitude", "longitude", "radalt"
 ]
-df = pd.read_csv("data/P1152-line-elevation.dat", sep=r"\s+", header=None, names=col_names)
+# Only the three columns used are parsed; coordinates keep full precision
+df = pd.read_csv(
+    "data/P1152-line-elevation.dat", sep=r"\s+", engine="c", header=None,
+    names=col_names, usecols=["ground", "latitude", "longitude"],
+    dtype={"ground": np.float32, "latitude": np.float64, "longitude": np.float64}
+)
 
-# Replace null values
-df.replace({
-    -9.9999999999e+32: np.nan,
-    -9.9999999: np.nan,
-    -9999999: np.nan
-}, inplace=True)
-df.dropna(subset=["latitude", "longitude", "ground"], inplace=True)
+# Drop null rows: the survey's sentinels are all large negatives, plus a
+# -9.9999999 marker, so one vectorised mask per column replaces df.replace
+keep = np.ones(len(df), dtype=bool)
+for col in ("latitude", "longitude", "ground"):
+    values = df[col].to_numpy()
+    keep &= np.isfinite(values) & (values > -999999) & (values != values.dtype.type(-9.9999999))
+df = df[keep]
 
 # 2) Determine bounds
 minx, maxx = df["longitude"].min(), df["longitude"].max()
@@ -27,22 +43,37 @@ miny, maxy = df["latitude"].min(), df["latitude"].max()
 nx, ny = 800, 800
 grid_lon = np.linspace(minx, maxx, nx)
 grid_lat = np.linspace(miny, maxy, ny)
-XI, YI = np.meshgrid(grid_lon, grid_lat)
+# Sparse (1 x nx, ny x 1) views; the interpolator broadcasts them itself
+XI, YI = np.meshgrid(grid_lon, grid_lat, sparse=True)
 
 # 4) Interpolate elevation
 pts_lon = df["longitude"].to_numpy()
 pts_lat = df["latitude"].to_numpy()
 pts_elev = df["ground"].to_numpy()
 
-grid_elev_lin = griddata(
-    (pts_lon, pts_lat), pts_elev, (XI, YI), method="linear", fill_value=np.nan
-)
-grid_elev_near = griddata(
-    (pts_lon, pts_lat), pts_elev, (XI, YI), method="nearest"
-)
+# Triangulate once for the linear pass; the nearest fallback uses a flat
+# bucket grid over the same points
+tri = Delaunay(np.column_stack([pts_lon, pts_lat]))
+lin = LinearNDInterpolator(tri, pts_elev, fill_value=np.nan)
+index = GridIndex(pts_lon, pts_lat)
+
+# Evaluate in 64 x 64 tiles: each tile's queries walk a small, cache-resident
+# patch of the triangulation, and the simplex walk releases the GIL so the
+# tiles run on a thread pool
+TILE = 64
+grid_elev = np.empty((ny, nx))
+
+def interp_tile(i0, j0):
+    grid_elev[i0:i0 + TILE, j0:j0 + TILE] = lin(XI[:, j0:j0 + TILE], YI[i0:i0 + TILE, :])
 
-# Fill missing values
-grid_elev = np.where(np.isnan(grid_elev_lin), grid_elev_near, grid_elev_lin)
+with ThreadPoolExecutor() as pool:
+    tiles = [pool.submit(interp_tile, i0, j0) for i0 in range(0, ny, TILE) for j0 in range(0, nx, TILE)]
+    for tile in tiles:
+        tile.result()
+
+# Fill missing values (outside the convex hull) with the nearest point only
+mask = np.isnan(grid_elev)
+index.fill(grid_lon, grid_lat, mask, pts_elev, grid_elev)
 
 # 5) Plot rasterized elevation
 fig, ax = plt.subplots(figsize=(10, 8))
@@ -51,4 +82,8 @@ ax.set_title("Interpolated Elevation Raster")
 plt.colorbar(im, ax=ax, label='Elevation (m)')
 plt.xlabel("Longitude")
 plt.ylabel("Latitude")
-plt.show()
+
+if FORMAT == "png":
+    fig.savefig("elevation_raster.png", dpi=150)
+else:
+    plt.show()
@@ -9,15 +9,23 @@ cols = [
 ]
 
 # Load data
-df = pd.read_csv('data/P1152-line-elevation.dat', delim_whitespace=True, header=None, names=cols)
-
-# Drop nulls / replace large null values with np.nan
-df.replace([-9999999, -99999999, -999999, -9.999999e+32, -9.9999999999e+32], np.nan, inplace=True)
-df.dropna(subset=['latitude', 'longitude', 'ground'], inplace=True)
+# Only the three columns used are parsed; coordinates keep full precision
+df = pd.read_csv(
+    'data/P1152-line-elevation.dat', sep=r'\s+', engine='c', header=None,
+    names=cols, usecols=['ground', 'latitude', 'longitude'],
+    dtype={'ground': np.float32, 'latitude': np.float64, 'longitude': np.float64}
+)
+
+# Drop nulls: every sentinel is <= -999999, so one vectorised mask per column
+# replaces the per-value df.replace scan
+keep = np.ones(len(df), dtype=bool)
+for col in ('latitude', 'longitude', 'ground'):
+    values = df[col].to_numpy()
+    keep &= np.isfinite(values) & (values > -999999)
+df = df[keep]
 
 from scipy.interpolate import griddata
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
+import plotly.graph_objects as go
 
 # Prepare arrays
 points = df[['longitude', 'latitude']].values
@@ -26,17 +34,27 @@ values = df['ground'].values
 # Create a grid
 lon_lin = np.linspace(df['longitude'].min(), df['longitude'].max(), 300)
 lat_lin = np.linspace(df['latitude'].min(), df['latitude'].max(), 300)
-lon_grid, lat_grid = np.meshgrid(lon_lin, lat_lin)
+lon_grid, lat_grid = np.meshgrid(lon_lin, lat_lin, sparse=True)
 
 # Interpolate the ground height values
 elevation_grid = griddata(points, values, (lon_grid, lat_grid), method='linear')
 
-# Plot the terrain
-fig = plt.figure(figsize=(10, 8))
-ax = fig.add_subplot(111, projection='3d')
-ax.plot_surface(lon_grid, lat_grid, elevation_grid, cmap='terrain')
-ax.set_title("Queensland Terrain Elevation")
-ax.set_xlabel("Longitude")
-ax.set_ylabel("Latitude")
-ax.set_zlabel("Elevation (m)")
-plt.show()
+# Plot the terrain (WebGL surface; float32 z ships as a typed array)
+fig = go.Figure(go.Surface(
+    x=lon_lin,
+    y=lat_lin,
+    z=elevation_grid.astype(np.float32),
+    colorscale='earth',
+    colorbar=dict(title='Elevation (m)')
+))
+fig.update_layout(
+    title="Queensland Terrain Elevation",
+    scene=dict(
+        xaxis_title='Longitude',
+        yaxis_title='Latitude',
+        zaxis_title='Elevation (m)'
+    ),
+    width=1000,
+    height=800
+)
+fig.write_html("terrain.html", include_plotlyjs="cdn", full_html=True, include_mathjax=False)